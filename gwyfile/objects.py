@@ -3,15 +3,48 @@
 See <http://gwyddion.net/documentation/user-guide-en/gwyfile-format.html>
 for a specification of Gwyddion native data files.
 """
+import mmap
 import struct
+import sys
 from collections import OrderedDict
+from functools import lru_cache, partial
 import numpy as np
 
-from six import BytesIO, string_types
-from six.moves import range
 
+# Precompiled structs for fixed-size fields
+_S_I = struct.Struct('<I')
+_S_i = struct.Struct('<i')
+_S_q = struct.Struct('<q')
+_S_d = struct.Struct('<d')
+_scalar_structs = {'i': _S_i, 'q': _S_q, 'd': _S_d}
 
-class GwyObject(OrderedDict):
+# Numpy dtypes and item sizes for the array typecodes
+_array_dtypes = {
+    'C': np.dtype('<S'), 'I': np.dtype('<i4'),
+    'Q': np.dtype('<i8'), 'D': np.dtype('<f8')
+}
+_array_itemsizes = {k: v.itemsize for k, v in _array_dtypes.items()}
+
+# One-character typecode strings indexed by byte value
+_typecode_chars = [chr(_byte) for _byte in range(256)]
+
+# Encoded typecode bytes by typecode string
+_typecode_bytes = {_char: _char.encode('ascii') for _char in 'obcsiqdCIQDSO'}
+
+# Interned component and object names, keyed by their raw encoding
+_name_intern = {}
+
+
+def _decode_name(raw):
+    """Decode a component or object name, interning repeated names."""
+    name = _name_intern.get(raw)
+    if name is None:
+        name = sys.intern(raw.decode('utf-8'))
+        _name_intern[raw] = name
+    return name
+
+
+class GwyObject(dict):
     """GwyObject.
 
     Parameters
@@ -23,16 +56,33 @@ class GwyObject(OrderedDict):
     typecodes : dict
         Dictionary of component typecodes.
     """
+    # Class-constant typecodes, overridden by subclasses
+    _DEFAULT_TYPECODES = {}
+
     def __init__(self, name, data=None, typecodes=None):
-        OrderedDict.__init__(self)
+        dict.__init__(self)
         self.name = name
         # For each object attribute, we (optionally) store its type
-        self.typecodes = {}
+        self.typecodes = dict(self._DEFAULT_TYPECODES)
         if isinstance(data, dict):
             self.update(data)
         if isinstance(typecodes, dict):
             self.typecodes.update(typecodes)
 
+    @classmethod
+    def _from_parsed(cls, name, data, typecodes):
+        """Build an instance from already-parsed components.
+
+        Bypasses `__init__`: the component dictionary and typecodes are
+        installed directly instead of being copied a second time.
+        """
+        obj = cls.__new__(cls)
+        dict.__init__(obj)
+        obj.name = name
+        obj.typecodes = typecodes
+        dict.update(obj, data)
+        return obj
+
     def __str__(self):
         return '<GwyObject "{name}">({keys})'.format(
             name=self.name,
@@ -40,7 +90,7 @@ class GwyObject(OrderedDict):
         )
 
     @classmethod
-    def frombuffer(cls, buf, return_size=False):
+    def frombuffer(cls, buf, return_size=False, offset=0):
         """Interpret a buffer as a serialized GwyObject.
 
         Parameters
@@ -48,59 +98,83 @@ class GwyObject(OrderedDict):
         buf : buffer_like
             Buffer.
         return_size : bool
-            If `True`, the size of the component within the buffer is returned as
-            well.
+            If `True`, the offset of the first byte past the object is
+            returned as well.
+        offset : int
+            Position of the object within `buf`.
         """
-        pos = buf.find(b'\0')
-        name = buf[:pos].decode('utf-8')
-        size = struct.unpack('<I', buf[pos + 1:pos + 5])[0]
-        object_data = buf[pos + 5:pos + 5 + size]
-        buf = object_data
-        data = OrderedDict()
-        typecodes = {}
-        while len(buf) > 0:
-            (component_name, component_data, component_typecode,
-             component_size) = component_from_buffer(buf, return_size=True)
-            data[component_name] = component_data
-            typecodes[component_name] = component_typecode
-            buf = buf[component_size:]
-        try:
-            # Initialize corresponding Gwyddion object
-            type_class = _gwyddion_types[name]
-            obj = type_class(data=data, typecodes=typecodes)
-        except KeyError:
-            obj = GwyObject(name, data, typecodes=typecodes)
+        obj, end = _parse_object(buf, offset)
         if return_size:
-            return obj, len(name) + 5 + size
+            return obj, end
         return obj
 
     def serialize(self):
         """Return the binary representation."""
-        io = BytesIO()
-        for k in self.keys():
-            try:
-                typecode = self.typecodes[k]
-            except KeyError:
-                typecode = None
-            io.write(serialize_component(k, self[k], typecode))
-        buf = io.getvalue()
-        return b''.join([
-            self.name.encode('utf-8'),
-            b'\0',
-            struct.pack('<I', len(buf)),
-            buf
-        ])
+        out = bytearray()
+        self._serialize_into(out)
+        return bytes(out)
+
+    def _serialize_into(self, out):
+        """Append the binary representation to the bytearray `out`.
+
+        Components are written directly into `out`; the object size is
+        patched into its header slot afterwards.
+        """
+        out += _encode_name(self.name)
+        sizepos = len(out)
+        out += b'\x00\x00\x00\x00'
+        typecodes_get = self.typecodes.get
+        run = []
+        run_values = []
+        for k, v in self.items():
+            typecode = typecodes_get(k)
+            if typecode is None:
+                typecode = guess_typecode(v)
+            if typecode in _scalar_structs:
+                # Consecutive scalars are packed with a single call
+                run.append((k, typecode))
+                run_values.append(v)
+                continue
+            if run:
+                out += _pack_scalar_run(tuple(run), run_values)
+                run = []
+                run_values = []
+            if typecode == 'o':
+                out += _encode_name(k)
+                out += b'o'
+                v._serialize_into(out)
+            elif typecode == 'O':
+                out += _encode_name(k)
+                out += b'O'
+                out += _S_I.pack(len(v))
+                for obj in v:
+                    obj._serialize_into(out)
+            elif typecode in _array_dtypes:
+                out += _encode_name(k)
+                out += _typecode_bytes[typecode]
+                _append_array(out, v, _array_dtypes[typecode])
+            else:
+                out += serialize_component(k, v, typecode)
+        if run:
+            out += _pack_scalar_run(tuple(run), run_values)
+        _S_I.pack_into(out, sizepos, len(out) - sizepos - 4)
 
     @classmethod
     def fromfile(cls, file):
         """Create a GwyObject from the data stored in `file`.
 
+        The file is memory-mapped where possible, so array components of
+        the returned object may alias the mapped file contents and are
+        read-only; call `.copy()` on them to obtain independent arrays.
+        The mapping is kept alive through the returned object's `_mmap`
+        attribute.
+
         Parameters
         ----------
         file : file or str
             File object or filename.
         """
-        if isinstance(file, string_types):
+        if isinstance(file, str):
             with open(file, 'rb') as f:
                 return GwyObject._read_file(f)
         return GwyObject._read_file(file)
@@ -113,7 +187,7 @@ class GwyObject(OrderedDict):
         file : file or str
             File object or filename.
         """
-        if isinstance(file, string_types):
+        if isinstance(file, str):
             with open(file, 'wb') as f:
                 self._write_file(f)
         else:
@@ -121,13 +195,69 @@ class GwyObject(OrderedDict):
 
     @classmethod
     def _read_file(cls, f):
-        data = f.read()
+        try:
+            # Let the OS page the file in on demand instead of copying it
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Not a regular file (e.g. BytesIO) -- read it instead
+            data = f.read()
         assert data[:4] == b'GWYP'
-        return cls.frombuffer(data[4:])
+        obj = cls.frombuffer(data, offset=4)
+        if isinstance(data, mmap.mmap):
+            # Tie the mapping's lifetime to the returned object so
+            # buffer-backed arrays can never outlive their pages
+            obj._mmap = data
+        return obj
 
     def _write_file(self, f):
-        f.write(b'GWYP')
-        f.write(self.serialize())
+        out = bytearray(b'GWYP')
+        self._serialize_into(out)
+        f.write(out)
+
+
+class _Component(object):
+    """Data descriptor exposing an object component as an attribute.
+
+    Parameters
+    ----------
+    key : str
+        Component name.
+    default
+        Value returned while the component is missing.
+    drop_if_none : bool
+        If `True`, assigning `None` removes the component.
+    doc : str
+        Attribute docstring.
+    """
+    def __init__(self, key, default=None, drop_if_none=True, doc=None):
+        self.key = key
+        self.default = default
+        self.drop_if_none = drop_if_none
+        self.__doc__ = doc
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.get(self.key, self.default)
+
+    def __set__(self, obj, value):
+        if value is None and self.drop_if_none:
+            obj.pop(self.key, None)
+        else:
+            obj[self.key] = value
+
+
+class _UnitComponent(_Component):
+    """Component holding a `GwySIUnit`; unit strings are converted.
+
+    Strings are resolved through `_intern_unit`, so the resulting
+    `GwySIUnit` instances are shared between objects and must not be
+    mutated in place.
+    """
+    def __set__(self, obj, value):
+        if isinstance(value, str):
+            value = _intern_unit(value)
+        _Component.__set__(self, obj, value)
 
 
 class GwyContainer(GwyObject):
@@ -143,14 +273,8 @@ class GwyContainer(GwyObject):
     def __init__(self, data=None, typecodes=None):
         super(GwyContainer, self).__init__('GwyContainer', data, typecodes)
 
-    @property
-    def filename(self):
-        """Associated container filename."""
-        return self.get('/filename', None)
-
-    @filename.setter
-    def filename(self, name):
-        self['/filename'] = name
+    filename = _Component('/filename', drop_if_none=False,
+                          doc="Associated container filename.")
 
 
 class GwyDataField(GwyObject):
@@ -175,6 +299,12 @@ class GwyDataField(GwyObject):
     typecodes : dict
         Dictionary of component typecodes.
     """
+    _DEFAULT_TYPECODES = {
+        'xres': 'i', 'yres': 'i',
+        'xreal': 'd', 'yreal': 'd',
+        'xoff': 'd', 'yoff': 'd',
+    }
+
     def __init__(self, data,
                  xreal=1.0, yreal=1.0, xoff=0, yoff=0,
                  si_unit_xy=None, si_unit_z=None,
@@ -182,113 +312,67 @@ class GwyDataField(GwyObject):
         super(GwyDataField, self).__init__('GwyDataField', typecodes=typecodes)
         if isinstance(data, OrderedDict):
             self.update(data)
+            self._reshape_data()
         else:
             assert isinstance(data, np.ndarray) and len(data.shape) == 2
             self.xreal, self.yreal = xreal, yreal
             self.xoff, self.yoff = xoff, yoff
             self.si_unit_xy, self.si_unit_z = si_unit_xy, si_unit_z
             self.data = data
-        self.typecodes.update({
-            'xres': 'i', 'yres': 'i',
-            'xreal': 'd', 'yreal': 'd',
-            'xoff': 'd', 'yoff': 'd',
-        })
+
+    @classmethod
+    def _from_parsed(cls, name, data, typecodes):
+        obj = super(GwyDataField, cls)._from_parsed(name, data, typecodes)
+        obj._reshape_data()
+        return obj
+
+    def _reshape_data(self):
+        """Store the field data in its 2-D shape."""
+        data = self.get('data')
+        if data is not None and data.ndim == 1:
+            self['data'] = data.reshape((self['yres'], self['xres']))
 
     @property
     def data(self):
-        """Container data."""
-        xres, yres = self['xres'], self['yres']
-        return self['data'].reshape((yres, xres))
+        """Container data as a 2-D array of shape (yres, xres)."""
+        return self['data']
 
     @data.setter
     def data(self, new_data):
+        # A contiguous array is stored as a view, not a copy; pass
+        # `new_data.copy()` if the field must not alias the source.
         assert isinstance(new_data, np.ndarray) and new_data.ndim == 2
         yres, xres = new_data.shape
         self['xres'], self['yres'] = xres, yres
-        self['data'] = new_data.flatten()
-
-    @property
-    def xreal(self):
-        """Width in physical units."""
-        return self.get('xreal', None)
-
-    @xreal.setter
-    def xreal(self, width):
-        if width is None:
-            if 'xreal' in self:
-                del self['xreal']
-        else:
-            self['xreal'] = width
-
-    @property
-    def yreal(self):
-        """Height in physical units."""
-        return self.get('yreal', None)
-
-    @yreal.setter
-    def yreal(self, height):
-        if height is None:
-            if 'yreal' in self:
-                del self['yreal']
-        else:
-            self['yreal'] = height
-
-    @property
-    def xoff(self):
-        """Horizontal offset of top-left corner in physical units."""
-        return self.get('xoff', 0)
-
-    @xoff.setter
-    def xoff(self, offset):
-        self['xoff'] = offset
-
-    @property
-    def yoff(self):
-        """Vertical offset of top-left corner in physical units."""
-        return self.get('yoff', 0)
-
-    @yoff.setter
-    def yoff(self, offset):
-        self['yoff'] = offset
-
-    @property
-    def si_unit_xy(self):
-        """Unit of lateral dimensions."""
-        return self.get('si_unit_xy', None)
-
-    @si_unit_xy.setter
-    def si_unit_xy(self, unit):
-        if unit is None:
-            if 'si_unit_xy' in self:
-                del self['si_unit_xy']
-        elif isinstance(unit, string_types):
-            self['si_unit_xy'] = GwySIUnit(unitstr=unit)
-        else:
-            self['si_unit_xy'] = unit
-
-    @property
-    def si_unit_z(self):
-        """Unit of data values."""
-        return self.get('si_unit_z', None)
-
-    @si_unit_z.setter
-    def si_unit_z(self, unit):
-        if unit is None:
-            if 'si_unit_z' in self:
-                del self['si_unit_z']
-        elif isinstance(unit, string_types):
-            self['si_unit_z'] = GwySIUnit(unitstr=unit)
-        else:
-            self['si_unit_z'] = unit
+        self['data'] = np.ascontiguousarray(new_data)
+
+    def validate(self):
+        """Return `True` if the field data contains only finite values."""
+        return bool(np.isfinite(self['data']).all())
+
+    xreal = _Component('xreal', doc="Width in physical units.")
+    yreal = _Component('yreal', doc="Height in physical units.")
+    xoff = _Component(
+        'xoff', default=0, drop_if_none=False,
+        doc="Horizontal offset of top-left corner in physical units."
+    )
+    yoff = _Component(
+        'yoff', default=0, drop_if_none=False,
+        doc="Vertical offset of top-left corner in physical units."
+    )
+    si_unit_xy = _UnitComponent('si_unit_xy',
+                                doc="Unit of lateral dimensions.")
+    si_unit_z = _UnitComponent('si_unit_z', doc="Unit of data values.")
 
 
 class GwySIUnit(GwyObject):
+    _DEFAULT_TYPECODES = {'unitstr': 's'}
+
     def __init__(self, data=None, unitstr='', typecodes=None):
         super(GwySIUnit, self).__init__('GwySIUnit', typecodes=typecodes)
         if isinstance(data, OrderedDict):
             self.update(data)
         else:
-            self.typecodes['unitstr'] = 's'
             self.unitstr = unitstr
 
     @property
@@ -300,116 +384,480 @@ class GwySIUnit(GwyObject):
         self['unitstr'] = s
 
 
-def component_from_buffer(buf, return_size=False):
-    """Interpret a buffer as a serialized component.
+@lru_cache(maxsize=None)
+def _intern_unit(unitstr):
+    """Return a shared `GwySIUnit` for `unitstr`.
+
+    Files routinely contain thousands of fields with identical units,
+    so unit objects built from strings are interned. The returned
+    instance is shared; copy it before mutating.
+    """
+    return GwySIUnit(unitstr=unitstr)
+
+
+def component_from_buffer(buf, pos=0):
+    """Interpret a serialized component starting at `pos` within `buf`.
 
     Parameters
     ----------
-    return_size : bool
-        If `True`, the size of the component within the buffer is returned as
-        well.
+    buf : buffer_like
+        Buffer.
+    pos : int
+        Position of the component within `buf`.
+
+    Returns
+    -------
+    name, data, typecode, pos
+        Component name, value, typecode, and the offset of the first byte
+        past the component.
     """
-    pos = buf.find(b'\0')
-    name = buf[:pos].decode('utf-8')
-    typecode = buf[pos+1:pos+2].decode('utf-8')
-    pos += 2
-    data = None
-    endpos = pos
+    endpos = buf.find(b'\0', pos)
+    if endpos < 0:
+        raise ValueError('unterminated component name')
+    name = _decode_name(buf[pos:endpos])
+    typecode = _typecode_chars[buf[endpos + 1]]
+    pos = endpos + 2
     if typecode == 'o':
-        data, size = GwyObject.frombuffer(buf[pos:], return_size=True)
-        endpos += size
-    elif typecode == 's':
-        # NUL-terminated string
-        endpos = buf.find(b'\0', pos)
-        data = buf[pos:endpos].decode('utf-8')
-        endpos += 1
-    elif typecode == 'b':
-        # Boolean
-        data = ord(buf[pos:pos+1]) != 0
-        endpos += 1
-    elif typecode == 'c':
-        data = buf[pos]
-        endpos += 1
-    elif typecode == 'i':
-        data = struct.unpack('<i', buf[endpos:endpos + 4])[0]
-        endpos += 4
-    elif typecode == 'q':
-        data = struct.unpack('<q', buf[endpos:endpos + 8])[0]
-        endpos += 8
-    elif typecode == 'd':
-        data = struct.unpack('<d', buf[endpos:endpos + 8])[0]
-        endpos += 8
-    elif typecode in 'CIQD':
-        numitems = struct.unpack('<I', buf[pos:pos + 4])[0]
-        endpos += 4
-        typelookup = {
-            'C': np.dtype('<S'), 'I': np.dtype('<i4'),
-            'Q': np.dtype('<i8'), 'D': np.dtype('<f8')
-        }
-        dtype = typelookup[typecode]
-        pos, endpos = endpos, endpos + dtype.itemsize * numitems
-        data = np.frombuffer(buf[pos:endpos], dtype=dtype)
-    elif typecode == 'S':
-        numitems = struct.unpack('<I', buf[pos:pos + 4])[0]
-        endpos += 4
-        data = []
-        for _ in range(numitems):
-            pos = endpos
-            endpos = buf.find(b'\0', pos)
-            data.append(buf[pos:endpos].decode('utf-8'))
-            endpos += 1
+        data, pos = GwyObject.frombuffer(buf, return_size=True, offset=pos)
     elif typecode == 'O':
-        numitems = struct.unpack('<I', buf[pos:pos + 4])[0]
-        endpos += 4
+        numitems = _S_I.unpack_from(buf, pos)[0]
+        pos += 4
+        frombuffer = GwyObject.frombuffer
+        data = [None] * numitems
+        for i in range(numitems):
+            data[i], pos = frombuffer(buf, return_size=True, offset=pos)
+    else:
+        data, pos = _component_value(buf, pos, typecode)
+    return name, data, typecode, pos
+
+
+def _parse_s(buf, pos):
+    # NUL-terminated string
+    endpos = buf.find(b'\0', pos)
+    if endpos < 0:
+        raise ValueError('unterminated string')
+    return buf[pos:endpos].decode('utf-8'), endpos + 1
+
+
+def _parse_b(buf, pos):
+    # Boolean
+    return buf[pos] != 0, pos + 1
+
+
+def _parse_c(buf, pos):
+    return buf[pos], pos + 1
+
+
+def _parse_scalar(buf, pos, s):
+    return s.unpack_from(buf, pos)[0], pos + s.size
+
+
+def _parse_array(buf, pos, dtype, itemsize):
+    numitems = _S_I.unpack_from(buf, pos)[0]
+    pos += 4
+    # View into `buf` instead of copying -- the returned array aliases
+    # the file buffer and is therefore read-only.
+    data = np.frombuffer(buf, dtype=dtype, count=numitems, offset=pos)
+    return data, pos + itemsize * numitems
+
+
+def _parse_strings(buf, pos):
+    numitems = _S_I.unpack_from(buf, pos)[0]
+    pos += 4
+    endpos = pos
+    for _ in range(numitems):
+        endpos = buf.find(b'\0', endpos)
+        if endpos < 0:
+            raise ValueError('unterminated string')
+        endpos += 1
+    if numitems:
+        data = [s.decode('utf-8')
+                for s in buf[pos:endpos - 1].split(b'\0')]
+    else:
         data = []
-        for _ in range(numitems):
-            pos = endpos
-            objdata, size = GwyObject.frombuffer(buf[pos:], return_size=True)
-            data.append(objdata)
-            endpos += size
+    return data, endpos
+
+
+# Component value parsers by typecode ('o' and 'O' are handled by the
+# object parser itself)
+_parsers = {
+    's': _parse_s,
+    'b': _parse_b,
+    'c': _parse_c,
+    'S': _parse_strings,
+}
+for _typecode in 'iqd':
+    _parsers[_typecode] = partial(_parse_scalar,
+                                  s=_scalar_structs[_typecode])
+for _typecode in 'CIQD':
+    _parsers[_typecode] = partial(_parse_array,
+                                  dtype=_array_dtypes[_typecode],
+                                  itemsize=_array_itemsizes[_typecode])
+
+
+def _component_value(buf, pos, typecode):
+    """Parse the value of a non-object component at `pos` within `buf`.
+
+    Returns
+    -------
+    data, pos
+        Component value and the offset of the first byte past it.
+    """
+    try:
+        parser = _parsers[typecode]
+    except KeyError:
+        raise NotImplementedError
+    return parser(buf, pos)
+
+
+class _SchemaMismatch(Exception):
+    """Raised when a specialized reader does not match the buffer."""
+
+
+# Specialized readers generated from observed component layouts, keyed by
+# object type name. `None` marks types not worth specializing.
+_specialized_readers = {}
+
+# Objects with more components than this are not specialized; in practice
+# only containers exceed it, and their layout is unique per file anyway.
+_MAX_SPECIALIZED_COMPONENTS = 16
+
+
+def _compile_reader(schema):
+    """Generate a reader specialized for an observed component layout.
+
+    Parameters
+    ----------
+    schema : tuple of (str, str)
+        Sequence of `(component name, typecode)` pairs.
+
+    Returns
+    -------
+    read : callable
+        `read(buf, pos, end)` parsing the components of an object body
+        laid out exactly as `schema`, returning the component dictionary.
+        Raises `_SchemaMismatch` if the buffer deviates from the schema.
+    """
+    lines = [
+        'def _read(buf, pos, end):',
+        '    data = {}',
+    ]
+    for cname, typecode in schema:
+        prefix = cname.encode('utf-8') + b'\0' + typecode.encode('utf-8')
+        key = repr(cname)
+        lines += [
+            '    if buf[pos:pos + %d] != %r:' % (len(prefix), prefix),
+            '        raise _SchemaMismatch',
+            '    pos += %d' % len(prefix),
+        ]
+        if typecode in 'iqd':
+            lines += [
+                '    data[%s] = _S_%s.unpack_from(buf, pos)[0]'
+                % (key, typecode),
+                '    pos += %d' % _scalar_structs[typecode].size,
+            ]
+        elif typecode == 'b':
+            lines += [
+                '    data[%s] = buf[pos] != 0' % key,
+                '    pos += 1',
+            ]
+        elif typecode == 'c':
+            lines += [
+                '    data[%s] = buf[pos]' % key,
+                '    pos += 1',
+            ]
+        elif typecode == 's':
+            lines += [
+                "    strend = buf.find(b'\\0', pos)",
+                "    data[%s] = buf[pos:strend].decode('utf-8')" % key,
+                '    pos = strend + 1',
+            ]
+        elif typecode == 'o':
+            lines += [
+                '    data[%s], pos = GwyObject.frombuffer('
+                'buf, return_size=True, offset=pos)' % key,
+            ]
+        elif typecode in 'IQD':
+            dtype, itemsize = {
+                'I': ('<i4', 4), 'Q': ('<i8', 8), 'D': ('<f8', 8)
+            }[typecode]
+            lines += [
+                '    numitems = _S_I.unpack_from(buf, pos)[0]',
+                '    pos += 4',
+                "    data[%s] = np.frombuffer(buf, dtype='%s', "
+                'count=numitems, offset=pos)' % (key, dtype),
+                '    pos += %d * numitems' % itemsize,
+            ]
+        else:
+            # Variable-layout typecodes go through the generic parser
+            lines += [
+                '    cname, cdata, ctypecode, pos = '
+                'component_from_buffer(buf, pos - %d)' % len(prefix),
+                '    if cname != %s or ctypecode != %r:' % (key, typecode),
+                '        raise _SchemaMismatch',
+                '    data[cname] = cdata',
+            ]
+    lines += [
+        '    if pos != end:',
+        '        raise _SchemaMismatch',
+        '    return data',
+    ]
+    namespace = {}
+    exec(compile('\n'.join(lines), '<gwyfile specialized reader>', 'exec'),
+         globals(), namespace)
+    return namespace['_read']
+
+
+def _build_object(name, data, typecodes):
+    """Construct the object registered for the type name `name`."""
+    # Pick the corresponding Gwyddion object type
+    type_class = _gwyddion_types.get(name) or GwyObject
+    return type_class._from_parsed(name, data, typecodes)
+
+
+def _parse_object(buf, offset):
+    """Parse a serialized GwyObject at `offset` within `buf`.
+
+    Nested objects are handled with an explicit stack of unfinished
+    frames instead of recursing per object.
+
+    Returns
+    -------
+    obj, pos
+        The parsed object and the offset of the first byte past it.
+    """
+    # Unfinished objects: [name, data, typecodes, end, slot] where `slot`
+    # is the (container, key) pair receiving the finished object, or None
+    # for the root. `arrays` tracks object arrays under construction as
+    # [target_list, numitems, index], innermost last.
+    stack = []
+    arrays = []
+    slot = None
+    pos = offset
+    while True:
+        # -- start the object at `pos`
+        nul = buf.find(b'\0', pos)
+        if nul < 0:
+            raise ValueError('unterminated object name')
+        name = _decode_name(buf[pos:nul])
+        size = _S_I.unpack_from(buf, nul + 1)[0]
+        pos = nul + 5
+        end = pos + size
+        obj = None
+        reader = _specialized_readers.get(name)
+        if reader is not None:
+            read, typecodes = reader
+            try:
+                data = read(buf, pos, end)
+            except (_SchemaMismatch, ValueError, struct.error):
+                pass
+            else:
+                pos = end
+                # Copy the cached typecodes -- the object takes ownership
+                obj = _build_object(name, data, dict(typecodes))
+        if obj is None:
+            stack.append([name, {}, {}, end, slot])
+
+        # -- parse components of the innermost frame, unwinding frames
+        # (and attaching finished objects) as they complete
+        while True:
+            if obj is not None:
+                if slot is None:
+                    return obj, pos
+                target, key = slot
+                target[key] = obj
+                obj = None
+                if arrays and target is arrays[-1][0]:
+                    array = arrays[-1]
+                    array[2] += 1
+                    if array[2] < array[1]:
+                        # next array element starts at `pos`
+                        slot = (array[0], array[2])
+                        break
+                    arrays.pop()
+            fname, fdata, ftypecodes, fend, fslot = stack[-1]
+            while pos < fend:
+                nul = buf.find(b'\0', pos)
+                if nul < 0:
+                    raise ValueError('unterminated component name')
+                cname = _decode_name(buf[pos:nul])
+                typecode = _typecode_chars[buf[nul + 1]]
+                pos = nul + 2
+                ftypecodes[cname] = typecode
+                if typecode == 'o':
+                    slot = (fdata, cname)
+                    break
+                elif typecode == 'O':
+                    numitems = _S_I.unpack_from(buf, pos)[0]
+                    pos += 4
+                    items = [None] * numitems
+                    fdata[cname] = items
+                    if numitems:
+                        arrays.append([items, numitems, 0])
+                        slot = (items, 0)
+                        break
+                else:
+                    fdata[cname], pos = _component_value(buf, pos, typecode)
+            else:
+                # frame complete
+                stack.pop()
+                if fname not in _specialized_readers:
+                    schema = tuple((k, ftypecodes[k]) for k in fdata)
+                    if len(schema) <= _MAX_SPECIALIZED_COMPONENTS:
+                        _specialized_readers[fname] = (
+                            _compile_reader(schema), dict(ftypecodes))
+                    else:
+                        _specialized_readers[fname] = None
+                obj = _build_object(fname, fdata, ftypecodes)
+                slot = fslot
+                continue
+            # a nested object starts at `pos`
+            break
+
+
+def _str_typecode(value):
+    return 'c' if len(value) == 1 else 's'
+
+
+def _int_typecode(value):
+    return 'i' if abs(value) < 2**31 else 'q'
+
+
+def _ndarray_typecode(value):
+    t = value.dtype.type
+    if t == np.dtype('f8'):
+        return 'D'
+    elif t == np.dtype('i8'):
+        return 'Q'
+    elif t == np.dtype('i4'):
+        return 'I'
+    elif t == np.dtype('S'):
+        return 'C'
     else:
         raise NotImplementedError
-    if return_size:
-        return name, data, typecode, endpos
-    return name, data, typecode
+
+
+# Typecode dispatch on the exact value type
+_typecode_handlers = {
+    bool: lambda value: 'b',
+    int: _int_typecode,
+    float: lambda value: 'd',
+    np.ndarray: _ndarray_typecode,
+    str: _str_typecode,
+}
 
 
 def guess_typecode(value):
     """Guess Gwyddion typecode for `value`."""
-    if np.isscalar(value) and hasattr(value, 'item'):
-        # Seems to be a numpy type -- convert
-        value = value.item()
+    handler = _typecode_handlers.get(type(value))
+    if handler is not None:
+        return handler(value)
+    # Slow path: subclasses and numpy scalars
     if isinstance(value, GwyObject):
         return 'o'
-    elif isinstance(value, string_types):
-        if len(value) == 1:
-            return 'c'
-        else:
-            return 's'
-    elif type(value) is bool:
-        return 'b'
-    elif type(value) is int:
-        if abs(value) < 2**31:
-            return 'i'
-        else:
-            return 'q'
-    elif type(value) is float:
-        return 'd'
-    elif type(value) is np.ndarray:
-        t = value.dtype.type
-        if t == np.dtype('f8'):
-            return 'D'
-        elif t == np.dtype('i8'):
-            return 'Q'
-        elif t == np.dtype('i4'):
-            return 'I'
-        elif t == np.dtype('S'):
-            return 'C'
-        else:
-            raise NotImplementedError
-    else:
-        raise NotImplementedError('{}, type: {}'.format(value,
-                                                        type(value)))
+    if isinstance(value, np.ndarray):
+        return _ndarray_typecode(value)
+    if isinstance(value, str):
+        return _str_typecode(value)
+    if np.isscalar(value) and hasattr(value, 'item'):
+        # Seems to be a numpy type -- convert
+        return guess_typecode(value.item())
+    raise NotImplementedError('{}, type: {}'.format(value,
+                                                    type(value)))
+
+
+@lru_cache(maxsize=1024)
+def _scalar_run_struct(run):
+    """Compiled struct and component prefixes for a run of scalars.
+
+    `run` is a tuple of `(component name, typecode)` pairs. The struct
+    packs each component's name, NUL separator, typecode byte, and value
+    in a single call.
+    """
+    fmt = ['<']
+    prefixes = []
+    for name, typecode in run:
+        prefix = name.encode('utf-8') + b'\0' + typecode.encode('utf-8')
+        prefixes.append(prefix)
+        fmt.append('{}s{}'.format(len(prefix), typecode))
+    return struct.Struct(''.join(fmt)), tuple(prefixes)
+
+
+def _pack_scalar_run(run, values):
+    """Serialize consecutive scalar components with one struct call."""
+    s, prefixes = _scalar_run_struct(run)
+    args = [None] * (2 * len(values))
+    args[0::2] = prefixes
+    args[1::2] = values
+    return s.pack(*args)
+
+
+def _serialize_s(value):
+    return value.encode('utf-8') + b'\0'
+
+
+def _serialize_c(value):
+    return value.encode('utf-8')
+
+
+def _serialize_b(value):
+    return b'\x01' if value else b'\x00'
+
+
+@lru_cache(maxsize=4096)
+def _encode_name(name):
+    """Return the encoded component name with its terminating NUL."""
+    return name.encode('utf-8') + b'\0'
+
+
+def _append_array(out, value, target):
+    """Append an array payload to the bytearray `out`.
+
+    Arrays already in wire format are appended through the buffer
+    protocol without an intermediate `tobytes` copy.
+    """
+    if value.dtype != target:
+        value = value.astype(target)
+    elif not value.flags.c_contiguous:
+        value = np.ascontiguousarray(value)
+    out += _S_I.pack(value.size)
+    out += value.data
+
+
+def _serialize_array(value, target):
+    out = bytearray()
+    _append_array(out, value, target)
+    return bytes(out)
+
+
+def _serialize_strings(value):
+    if not value:
+        return _S_I.pack(0)
+    return (_S_I.pack(len(value))
+            + b'\0'.join(s.encode('utf-8') for s in value) + b'\0')
+
+
+def _serialize_objects(value):
+    data = [_S_I.pack(len(value)), ]
+    data += [obj.serialize() for obj in value]
+    return b''.join(data)
+
+
+# Component payload serializers by typecode
+_serializers = {
+    'o': GwyObject.serialize,
+    's': _serialize_s,
+    'c': _serialize_c,
+    'b': _serialize_b,
+    'i': _S_i.pack,
+    'q': _S_q.pack,
+    'd': _S_d.pack,
+    'S': _serialize_strings,
+    'O': _serialize_objects,
+}
+for _typecode in 'CIQD':
+    _serializers[_typecode] = partial(_serialize_array,
+                                      target=_array_dtypes[_typecode])
 
 
 def serialize_component(name, value, typecode=None):
@@ -426,42 +874,13 @@ def serialize_component(name, value, typecode=None):
     """
     if typecode is None:
         typecode = guess_typecode(value)
-    if typecode == 'o':
-        buf = value.serialize()
-    elif typecode == 's':
-        buf = b''.join([value.encode('utf-8'), b'\0'])
-    elif typecode == 'c':
-        buf = value.encode('utf-8')
-    elif typecode == 'b':
-        buf = chr(value).encode('utf-8')
-    elif typecode in 'iqd':
-        buf = struct.pack('<' + typecode, value)
-    elif typecode in 'CIQD':
-        typelookup = {
-            'C': np.dtype('<S'), 'I': np.dtype('<i4'),
-            'Q': np.dtype('<i8'), 'D': np.dtype('<f8')
-        }
-        data = value.astype(typelookup[typecode]).data
-        buf = b''.join([
-            struct.pack('<I', len(value)),
-            memoryview(data).tobytes()
-        ])
-    elif typecode == 'S':
-        data = [struct.pack('<I', len(value)), ]
-        data += [s.encode('utf-8') + b'\0' for s in value]
-        buf = b''.join(data)
-    elif typecode == 'O':
-        data = [struct.pack('<I', len(value)), ]
-        data += [obj.serialize() for obj in value]
-        buf = b''.join(data)
-    else:
+    try:
+        serializer = _serializers[typecode]
+    except KeyError:
         raise NotImplementedError('name: {}, typecode: {}, type: {}'
                                   .format(name, typecode, type(value)))
-    return b''.join([
-        name.encode('utf-8'), b'\0',
-        typecode.encode('utf-8'),
-        buf
-    ])
+    buf = serializer(value)
+    return _encode_name(name) + _typecode_bytes[typecode] + buf
 
 
 # Type lookup table
@@ -18,12 +18,12 @@ setup(
         'Intended Audience :: Science/Research',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 3',
         'Topic :: Scientific/Engineering',
     ],
     keywords='gwyddion file format',
     platforms='any',
     license='MIT',
-    install_requires=['numpy', 'six'],
+    python_requires='>=3.7',
+    install_requires=['numpy'],
 )
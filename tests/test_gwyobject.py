@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import pytest
 import gwyfile
 
@@ -26,3 +27,19 @@ def test_datafield(test_data):
 def test_tofile(test_data, tmpdir):
     filename = str(tmpdir.join('output.gwy'))
     test_data.tofile(filename)
+
+
+def test_roundtrip(test_data):
+    buf = test_data.serialize()
+    obj = gwyfile.objects.GwyObject.frombuffer(buf)
+    assert obj.serialize() == buf
+
+
+def test_validate(test_data):
+    test_channel = gwyfile.util.get_datafields(test_data)['Test']
+    assert test_channel.validate()
+    # Loaded data aliases the file and is read-only -- modify a copy
+    data = test_channel.data.copy()
+    data[0][0] = np.nan
+    test_channel.data = data
+    assert not test_channel.validate()